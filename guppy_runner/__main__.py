@@ -8,26 +8,48 @@ The execution is composed of three steps:
     - Produce a runnable artifact from the LLVMIR file and the `qir-runner` runtime.
 """
 
-import logging
+from __future__ import annotations
+
 import sys
-from argparse import ArgumentParser, Namespace
+from argparse import ArgumentParser
 from pathlib import Path
 
-from guppy_runner import run_guppy_from_stage
-from guppy_runner.stage import (
-    EncodingMode,
-    Stage,
-    StageData,
+from guppy_runner._cli_fast import (
+    LLC_OPT_LEVELS,
+    RELEASE_OPT_LEVEL,
+    Args,
+    get_input_encoding,
+    get_input_state,
+    get_optimization_level,
+    parse_args_fast,
+    validate_args,
 )
-from guppy_runner.util import LOGGER
 
 
-def parse_args() -> Namespace:
+def parse_args() -> Args:
+    """Returns the parsed command line arguments."""
+    parser = None
+    args = parse_args_fast(sys.argv[1:])
+    if args is None:
+        parser = build_parser()
+        args = parser.parse_args(namespace=Args())
+
+    # Everything past this point may load the compilation modules, so it
+    # only runs once the arguments have been parsed successfully.
+    args.input_stage = get_input_state(args)
+    args.input_encoding = get_input_encoding(args)
+    error = validate_args(args)
+    if error is not None:
+        (parser or build_parser()).error(error)
+
+    return args
+
+
+def build_parser() -> ArgumentParser:
     """Returns a parser for the command line arguments."""
     parser = ArgumentParser(
         description="Execute a Guppy program using the qir-runner backend.",
     )
-
     parser.add_argument(
         "-v",
         "--verbose",
@@ -48,7 +70,7 @@ def parse_args() -> Namespace:
     input_args = parser.add_argument_group("Input options")
     input_args.add_argument(
         dest="input",
-        type=Path,
+        type=str,
         nargs="?",
         metavar="INPUT",
         help="Input program.\n"
@@ -100,14 +122,15 @@ def parse_args() -> Namespace:
     artifacts = parser.add_argument_group("Intermediary artifact outputs")
     artifacts.add_argument(
         "--store-hugr",
-        type=Path,
+        type=str,
         metavar="HUGR_OUTPUT[.msgpack|.json]",
         help="Store the intermediary Hugr object. "
-        "The file extension determines whether the file is encoded in msgpack or json.",
+        "The file extension determines whether the file is encoded in msgpack or json. "
+        "Defaults to msgpack.",
     )
     artifacts.add_argument(
         "--store-hugr-mlir",
-        type=Path,
+        type=str,
         metavar="MLIR.mlir",
         help="Store the intermediary hugr-dialect MLIR object. "
         "The file extension determines whether the file is encoded in textual (.mlir) "
@@ -115,7 +138,7 @@ def parse_args() -> Namespace:
     )
     artifacts.add_argument(
         "--store-llvm-mlir",
-        type=Path,
+        type=str,
         metavar="MLIR.mlir",
         help="Store the intermediary llvm-dialect MLIR object. "
         "The file extension determines whether the file is encoded in textual (.mlir) "
@@ -123,7 +146,7 @@ def parse_args() -> Namespace:
     )
     artifacts.add_argument(
         "--store-llvm",
-        type=Path,
+        type=str,
         metavar="LLVM.ll",
         help="Store the intermediary LLVMIR object."
         "The file extension determines whether the file is encoded in textual (.ll) or "
@@ -131,13 +154,13 @@ def parse_args() -> Namespace:
     )
     artifacts.add_argument(
         "--store-obj",
-        type=Path,
+        type=str,
         metavar="OBJ.o",
         help="Store the intermediary object file.",
     )
     artifacts.add_argument(
         "--store-bin",
-        type=Path,
+        type=str,
         metavar="a.out",
         help="Store the executable binary.",
     )
@@ -148,7 +171,7 @@ def parse_args() -> Namespace:
     runnable.add_argument(
         "-o",
         "--output",
-        type=Path,
+        type=str,
         metavar="OUTPUT",
         help="Runnable artifact output file.",
     )
@@ -159,84 +182,54 @@ def parse_args() -> Namespace:
         "`guppy-runner` will produce any required intermediary files, "
         "and terminate early.",
     )
+    optimization = runnable.add_mutually_exclusive_group()
+    optimization.add_argument(
+        "--llc-opt",
+        type=str,
+        choices=LLC_OPT_LEVELS,
+        help="The optimization level used by `llc` to produce the object file. "
+        "Defaults to 0.",
+    )
+    optimization.add_argument(
+        "--release",
+        action="store_true",
+        help=f"Optimize the object file with `--llc-opt {RELEASE_OPT_LEVEL}`.",
+    )
 
-    args = parser.parse_args()
-    args.input_stage = get_input_state(args)
-    args.input_encoding = get_input_encoding(args)
-    validate_args(args, parser)
-
-    return args
-
-
-def get_input_state(args: Namespace) -> Stage:
-    """The stage of the input file."""
-    if args.hugr:
-        return Stage.HUGR
-    if args.hugr_mlir:
-        return Stage.HUGR_MLIR
-    if args.llvm_mlir:
-        return Stage.LOWERED_MLIR
-    if args.llvm:
-        return Stage.LLVM
-    return Stage.GUPPY
+    return parser
 
 
-def get_input_encoding(args: Namespace) -> EncodingMode:
-    """The stage of the input file.
+def _as_path(path: str | None) -> Path | None:
+    """Convert an optional path argument into a `Path`.
 
-    If the encoding mode is not given, try to detect it from the file extension.
+    Path arguments are parsed as strings, and only converted where they are used.
     """
-    if args.textual:
-        return EncodingMode.TEXTUAL
-    if args.bitcode:
-        return EncodingMode.BITCODE
-
-    input_encoding = None
-    if args.input is not None:
-        input_encoding = EncodingMode.from_file(args.input, args.input_stage)
-    else:
-        input_encoding = EncodingMode.TEXTUAL
-
-    if input_encoding is None:
-        # Default to bitcode if reading from a file
-        input_encoding = EncodingMode.BITCODE
-        LOGGER.info(
-            "Cannot detect the encoding mode from the input file extension. "
-            "Defaulting to %s.",
-            input_encoding,
-        )
-    return input_encoding
-
-
-def validate_args(args: Namespace, parser: ArgumentParser) -> None:
-    """Validate whether can produce the intermediary artifacts from the input."""
-    store_requires = [
-        (args.store_hugr, Stage.HUGR),
-        (args.store_hugr_mlir, Stage.HUGR_MLIR),
-        (args.store_llvm_mlir, Stage.LOWERED_MLIR),
-        (args.store_llvm, Stage.LLVM),
-        (args.store_obj, Stage.OBJECT),
-        (args.store_bin, Stage.EXECUTABLE),
-    ]
-
-    for store, stage in store_requires:
-        if store is not None and args.input_stage >= stage:
-            parser.error(
-                f"Cannot produce a {stage.name} artifact from the given input.",
-            )
+    return Path(path) if path is not None else None
 
 
 def main() -> None:
     """Main entry point for the console script."""
     args = parse_args()
 
+    import logging
+
     if args.verbose:
         logging.basicConfig(level=logging.INFO)
+    else:
+        # Print warnings and errors, as python does for unconfigured loggers.
+        from guppy_runner.util import LOGGER
+
+        LOGGER.addHandler(logging.StreamHandler())
+
+    # Deferred so that `--help` and argument errors do not pay for loading the
+    # compilation pipeline.
+    from guppy_runner import run_guppy_from_stage
+    from guppy_runner.stage import StageData
 
     if args.input:
         stage_data = StageData.from_path(
             args.input_stage,
-            args.input,
+            Path(args.input),
             args.input_encoding,
         )
     else:
@@ -247,14 +240,15 @@ def main() -> None:
 
     success = run_guppy_from_stage(
         stage_data,
-        hugr_out=args.store_hugr,
-        hugr_mlir_out=args.store_hugr_mlir,
-        lowered_mlir_out=args.store_llvm_mlir,
-        llvm_out=args.store_llvm,
-        obj_out=args.store_obj,
-        bin_out=args.store_bin,
+        hugr_out=_as_path(args.store_hugr),
+        hugr_mlir_out=_as_path(args.store_hugr_mlir),
+        lowered_mlir_out=_as_path(args.store_llvm_mlir),
+        llvm_out=_as_path(args.store_llvm),
+        obj_out=_as_path(args.store_obj),
+        bin_out=_as_path(args.store_bin),
         no_run=args.no_run,
         module_name=args.module_name,
+        optimization_level=get_optimization_level(args),
     )
 
     if not success:
@@ -0,0 +1,208 @@
+"""Argument handling for the console interface.
+
+This module is fully annotated so it can be compiled with `mypyc`
+(see `just mypyc`). It must not import the compilation pipeline, so parsing
+the arguments stays cheap.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Compiled dataclasses need the field types at runtime. The stage module is
+# lightweight, unlike the compilation pipeline.
+from guppy_runner.stage import EncodingMode, Stage
+
+# The options accepted by `parse_args_fast`, as `flag: (dest, takes_value, group)`.
+# Options with the same non-empty group are mutually exclusive.
+# This must be kept in sync with `guppy_runner.__main__.build_parser`, as checked
+# by `tests/test_cli.py`.
+FLAG_TABLE: dict[str, tuple[str, bool, str]] = {
+    "-v": ("verbose", False, ""),
+    "--verbose": ("verbose", False, ""),
+    "--module": ("module_name", True, ""),
+    "--hugr": ("hugr", False, "input_mode"),
+    "--hugr-mlir": ("hugr_mlir", False, "input_mode"),
+    "--llvm-mlir": ("llvm_mlir", False, "input_mode"),
+    "--llvm": ("llvm", False, "input_mode"),
+    "--bitcode": ("bitcode", False, "input_encoding"),
+    "--textual": ("textual", False, "input_encoding"),
+    "--store-hugr": ("store_hugr", True, ""),
+    "--store-hugr-mlir": ("store_hugr_mlir", True, ""),
+    "--store-llvm-mlir": ("store_llvm_mlir", True, ""),
+    "--store-llvm": ("store_llvm", True, ""),
+    "--store-obj": ("store_obj", True, ""),
+    "--store-bin": ("store_bin", True, ""),
+    "-o": ("output", True, ""),
+    "--output": ("output", True, ""),
+    "--no-run": ("no_run", False, ""),
+    "--llc-opt": ("llc_opt", True, "optimization"),
+    "--release": ("release", False, "optimization"),
+}
+
+# The intermediary artifact options, in stage order.
+# `STORE_ARGS[i]` stores the artifact for `Stage(i + 1)`.
+STORE_ARGS = (
+    "store_hugr",
+    "store_hugr_mlir",
+    "store_llvm_mlir",
+    "store_llvm",
+    "store_obj",
+    "store_bin",
+)
+
+# Input file extensions with a known encoding mode.
+# See `EncodingMode.from_file` for the per-stage rules.
+_TEXTUAL_SUFFIXES = frozenset({".json", ".mlir", ".ll"})
+_BITCODE_SUFFIXES = frozenset({".msgpack", ".mlirbc", ".bc"})
+
+# The values accepted by `--llc-opt`, and the level used by `--release`.
+LLC_OPT_LEVELS = ("0", "1", "2", "3")
+RELEASE_OPT_LEVEL = 3
+
+
+@dataclass
+class Args:
+    """The parsed command line arguments.
+
+    `input_stage` and `input_encoding` are derived from the other arguments
+    after parsing.
+    """
+
+    verbose: bool = False
+    module_name: str | None = None
+    input: str | None = None
+    hugr: bool = False
+    hugr_mlir: bool = False
+    llvm_mlir: bool = False
+    llvm: bool = False
+    bitcode: bool = False
+    textual: bool = False
+    store_hugr: str | None = None
+    store_hugr_mlir: str | None = None
+    store_llvm_mlir: str | None = None
+    store_llvm: str | None = None
+    store_obj: str | None = None
+    store_bin: str | None = None
+    output: str | None = None
+    no_run: bool = False
+    llc_opt: str | None = None
+    release: bool = False
+    input_stage: Stage = field(init=False, repr=False, compare=False)
+    input_encoding: EncodingMode = field(init=False, repr=False, compare=False)
+
+
+def parse_args_fast(argv: list[str]) -> Args | None:
+    """Parse the command line arguments in a single pass over `FLAG_TABLE`.
+
+    Returns `None` if the arguments contain anything not described by the table
+    (e.g. `--help`, abbreviated options, or more than one input), or if two
+    mutually exclusive options are given. In those cases the full
+    `ArgumentParser` must be used instead, so it can report the usage or error.
+    """
+    args = Args()
+    group_counts = {"": 0, "input_mode": 0, "input_encoding": 0, "optimization": 0}
+
+    remaining = iter(argv)
+    for arg in remaining:
+        flag, eq, value = arg.partition("=") if arg.startswith("--") else (arg, "", "")
+        if flag not in FLAG_TABLE:
+            if arg.startswith("-") or args.input is not None:
+                return None
+            args.input = arg
+            continue
+
+        dest, takes_value, group = FLAG_TABLE[flag]
+        if takes_value and not eq:
+            value = next(remaining, "-")
+        if (eq and not takes_value) or value.startswith("-"):
+            return None
+        group_counts[group] += 1
+        if group and group_counts[group] > 1:
+            return None
+        setattr(args, dest, value if takes_value else True)
+
+    return args
+
+
+def get_input_state(args: Args) -> Stage:
+    """The stage of the input file."""
+    if args.hugr:
+        return Stage.HUGR
+    if args.hugr_mlir:
+        return Stage.HUGR_MLIR
+    if args.llvm_mlir:
+        return Stage.LOWERED_MLIR
+    if args.llvm:
+        return Stage.LLVM
+    return Stage.GUPPY
+
+
+def get_input_encoding(args: Args) -> EncodingMode:
+    """The stage of the input file.
+
+    If the encoding mode is not given, try to detect it from the file extension.
+    """
+    from guppy_runner.util import LOGGER
+
+    if args.textual:
+        return EncodingMode.TEXTUAL
+    if args.bitcode:
+        return EncodingMode.BITCODE
+
+    input_encoding = None
+    if args.input is None or args.input_stage == Stage.GUPPY:
+        input_encoding = EncodingMode.TEXTUAL
+    else:
+        suffix = Path(args.input).suffix.lower()
+        if suffix in _TEXTUAL_SUFFIXES:
+            input_encoding = EncodingMode.TEXTUAL
+        elif suffix in _BITCODE_SUFFIXES:
+            input_encoding = EncodingMode.BITCODE
+        else:
+            input_encoding = EncodingMode.from_file(
+                Path(args.input),
+                args.input_stage,
+            )
+
+    if input_encoding is None:
+        # Default to bitcode if reading from a file
+        input_encoding = EncodingMode.BITCODE
+        LOGGER.info(
+            "Cannot detect the encoding mode from the input file extension. "
+            "Defaulting to %s.",
+            input_encoding,
+        )
+    return input_encoding
+
+
+def get_optimization_level(args: Args) -> int:
+    """The `llc` optimization level for the object file."""
+    if args.release:
+        return RELEASE_OPT_LEVEL
+    return int(args.llc_opt or 0)
+
+
+def validate_args(args: Args) -> str | None:
+    """Validate whether can produce the intermediary artifacts from the input.
+
+    Returns an error message if the arguments are invalid.
+    """
+    if args.llc_opt is not None and args.llc_opt not in LLC_OPT_LEVELS:
+        return f"Invalid optimization level '{args.llc_opt}', expected 0 to 3."
+
+    # Only the stages up to and including the input stage cannot be produced,
+    # so the scan stops there. It is empty for Guppy inputs.
+    conflict = next(
+        (
+            i
+            for i, store in enumerate(STORE_ARGS[: args.input_stage.value])
+            if getattr(args, store) is not None
+        ),
+        None,
+    )
+    if conflict is not None:
+        stage = Stage(conflict + 1)
+        return f"Cannot produce a {stage.name} artifact from the given input."
+    return None
@@ -0,0 +1,149 @@
+"""A content-addressed cache for the intermediary compilation artifacts."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+from typing import TYPE_CHECKING
+
+from guppy_runner.compile import CompilerError
+from guppy_runner.stage import EncodingMode, StageData
+from guppy_runner.util import LOGGER, cache_dir, cache_enabled, hash_file
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from guppy_runner.compile import ArtifactWriter, StageCompiler
+
+
+class StageCache:
+    """A store for the outputs of each compilation stage.
+
+    Each artifact is keyed by a hash of the original input program, the
+    guppy_runner version, the module name, and the chain of stages, encodings,
+    and compilers that produced it. Each compiler is identified by its
+    `StageCompiler.cache_tag`, which covers the tool version and options. When a
+    stage output is found in the cache, its compiler is not executed.
+
+    Changes to the modules imported by a Guppy program are not detected. Clear
+    the cache directory after updating them.
+    """
+
+    root: Path
+
+    def __init__(self, root: Path) -> None:
+        """Initialize the cache."""
+        self.root = root
+
+    @classmethod
+    def from_env(cls) -> StageCache | None:
+        """Returns the user cache, if enabled.
+
+        The cache is enabled by setting the `GUPPY_RUNNER_CACHE` environment
+        variable to `1`.
+        """
+        if not cache_enabled():
+            return None
+        return cls(cache_dir() / "stages")
+
+    def input_key(self, data: StageData, module_name: str | None) -> str:
+        """Returns the cache key for an input program.
+
+        :raises CacheError: If the input file cannot be read.
+        """
+        from guppy_runner import __version__
+
+        digest = hashlib.sha256()
+        digest.update(
+            f"{__version__}:{data.stage.name}:{data.encoding.name}:{module_name}".encode(),
+        )
+        if data.data_path is not None:
+            try:
+                digest.update(hash_file(data.data_path))
+            except OSError as err:
+                raise CacheError(err) from err
+        elif isinstance(data.data, str):
+            digest.update(data.data.encode())
+        else:
+            digest.update(data.data)
+        return digest.hexdigest()
+
+    def run(  # noqa: PLR0913
+        self,
+        compiler: StageCompiler,
+        data: StageData,
+        key: str,
+        *,
+        output_file: Path | None = None,
+        module_name: str | None = None,
+        writer: ArtifactWriter | None = None,
+    ) -> tuple[StageData, str]:
+        """Run a compiler stage, reusing its output from the cache if available.
+
+        :param compiler: The compiler for the stage.
+        :param data: The input data, with cache key `key`.
+        :param key: The cache key of the input data.
+        :param output_file: Optional. A path to store the resulting artifact.
+        :param module_name: The name of the module being compiled.
+        :param writer: Optional. If given, artifacts are stored in the background.
+        :return: The output data and its cache key.
+        :raises CacheError: If a cached artifact cannot be copied to `output_file`.
+        """
+        stage = compiler.OUTPUT_STAGE
+        mode = compiler._get_output_mode(  # noqa: SLF001
+            output_file,
+            default=stage.default_encoding(),
+        )
+        output_key = hashlib.sha256(
+            f"{key}:{stage.name}:{mode.name}:{compiler.cache_tag()}".encode(),
+        ).hexdigest()
+        entry = self.root / stage.name.lower() / output_key
+
+        if entry.is_file():
+            LOGGER.info("Using cached %s artifact '%s'", stage.name, entry)
+            if output_file:
+                try:
+                    shutil.copy(entry, output_file)
+                except OSError as err:
+                    raise CacheError(err) from err
+            return StageData.from_path(stage, entry, mode), output_key
+
+        output = compiler.run(
+            data,
+            output_mode=mode,
+            output_file=output_file,
+            module_name=module_name,
+            writer=writer,
+        )
+        if writer is None:
+            self._store(output, entry)
+        else:
+            writer.submit(self._store, output, entry)
+        return output, output_key
+
+    def _store(self, data: StageData, entry: Path) -> None:
+        """Store an artifact in the cache.
+
+        Failing to write to the cache is not an error.
+        """
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry.with_suffix(f".{os.getpid()}.tmp")
+            if data.data_path is not None:
+                shutil.copy(data.data_path, tmp_path)
+            else:
+                mode = "w" if data.encoding == EncodingMode.TEXTUAL else "wb"
+                with tmp_path.open(mode=mode) as file:
+                    file.write(data.data)
+            tmp_path.replace(entry)
+        except OSError as err:
+            LOGGER.info("Could not cache the %s artifact: %s", data.stage.name, err)
+
+
+class CacheError(CompilerError):
+    """Raised when a file cannot be read from or copied out of the cache."""
+
+    def __init__(self, err: OSError) -> None:
+        """Initialize the error from the failed file operation."""
+        super().__init__(f"Cache error: {err}")
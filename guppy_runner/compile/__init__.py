@@ -5,11 +5,17 @@ from __future__ import annotations
 import sys
 import tempfile
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from guppy_runner.stage import EncodingMode, Stage, StageData
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import TracebackType
+
 
 class StageCompiler(ABC):
     """A compiler for a single stage of the Guppy execution workflow."""
@@ -44,6 +50,14 @@ class StageCompiler(ABC):
         :returns: Either the in-memory data, or a path to the output.
         """
 
+    def cache_tag(self) -> str:
+        """Describes the compiler version and options that affect the output.
+
+        Used to tell apart cached artifacts produced by different tools or with
+        different options.
+        """
+        return ""
+
     def _check_stage(self, data: StageData) -> None:
         if data.stage != self.INPUT_STAGE:
             raise InvalidStageError(data.stage, self.INPUT_STAGE)
@@ -58,7 +72,15 @@ class StageCompiler(ABC):
             return default
         return EncodingMode.from_file(out_file, self.OUTPUT_STAGE) or default
 
-    def _store_artifact(self, data: StageData, path: Path) -> None:
+    def _store_artifact(
+        self,
+        data: StageData,
+        path: Path,
+        writer: ArtifactWriter | None = None,
+    ) -> None:
+        if writer is not None:
+            writer.submit(self._store_artifact, data, path)
+            return
         mode = "w" if data.encoding == EncodingMode.TEXTUAL else "wb"
         with path.open(mode=mode) as file:
             file.write(data.data)
@@ -70,8 +92,12 @@ class StageCompiler(ABC):
         output_mode: EncodingMode | None = None,
         output_file: Path | None = None,
         module_name: str | None = None,
+        writer: ArtifactWriter | None = None,
     ) -> StageData:
-        """Transform the input into the following stage."""
+        """Transform the input into the following stage.
+
+        If a `writer` is given, the output artifact is stored in the background.
+        """
         self._check_stage(data)
 
         # Determine the output encoding.
@@ -101,11 +127,11 @@ class StageCompiler(ABC):
         if isinstance(output_data, Path):
             output = StageData.from_path(self.OUTPUT_STAGE, output_data, output_mode)
             if output_file and output_file != output_data:
-                self._store_artifact(output, output_file)
+                self._store_artifact(output, output_file, writer)
         else:
             output = StageData(self.OUTPUT_STAGE, output_data, output_mode)
             if output_file:
-                self._store_artifact(output, output_file)
+                self._store_artifact(output, output_file, writer)
 
         return output
 
@@ -160,6 +186,51 @@ class StageCompiler(ABC):
         )
 
 
+class ArtifactWriter:
+    """Stores the intermediary artifacts in a background thread.
+
+    This lets the next compilation stage start while the previous artifact is
+    still being written. Exiting the context manager waits for all the pending
+    writes, and re-raises the first error if any of them failed.
+
+    Note that write errors are only reported on exit. An unwritable output path
+    (e.g. a `--store-*` file in a missing directory) fails only after all the
+    following stages have run.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the writer."""
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="guppy-runner-writer",
+        )
+        self._pending: list[Future[None]] = []
+
+    def submit(self, fn: Callable[..., None], *args: Any) -> None:  # noqa: ANN401
+        """Schedule a write."""
+        self._pending.append(self._executor.submit(fn, *args))
+
+    def wait(self) -> None:
+        """Wait for all the pending writes to finish."""
+        self._executor.shutdown(wait=True)
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def __enter__(self) -> ArtifactWriter:  # noqa: PYI034
+        """Enter the context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Wait for the pending writes."""
+        self.wait()
+
+
 class CompilerError(Exception):
     """Base class for processor errors."""
 
@@ -1,6 +1,7 @@
 """Methods for compiling Guppy programs into HUGRs."""
 
 import importlib.machinery
+import importlib.metadata
 import types
 from pathlib import Path
 
@@ -51,6 +52,13 @@ class GuppyCompiler(StageCompiler):
             return hugr.serialize_json()
         return hugr.serialize()
 
+    def cache_tag(self) -> str:
+        """The installed guppylang version."""
+        try:
+            return importlib.metadata.version("guppylang")
+        except importlib.metadata.PackageNotFoundError:
+            return ""
+
     def _load_guppy_file(
         self,
         program_path: Path,
@@ -1,6 +1,7 @@
 """Methods for compiling HUGR-encoded guppy programs into MLIR objects."""
 
 
+import logging
 import os
 import subprocess
 from pathlib import Path
@@ -8,7 +9,7 @@ from subprocess import CalledProcessError
 
 from guppy_runner.compile import CompilerError, StageCompiler, UnsupportedEncodingError
 from guppy_runner.stage import EncodingMode, Stage
-from guppy_runner.util import LOGGER
+from guppy_runner.util import LOGGER, tool_identity
 
 HUGR_MLIR_TRANSLATE = "hugr-mlir-translate"
 HUGR_MLIR_TRANSLATE_ENV = "HUGR_MLIR_TRANSLATE"
@@ -42,11 +43,12 @@ class HugrCompiler(StageCompiler):
             if input_encoding == EncodingMode.TEXTUAL
             else "--hugr-rmp-to-mlir"
         )
-        cmd = [self._get_compiler()[0], input_mode_flag, input_path]
+        cmd: list[str | Path] = [self._get_compiler()[0], input_mode_flag, input_path]
 
-        cmd_str = " ".join(str(c) for c in cmd)
-        msg = f"Executing command: '{cmd_str}'"
-        LOGGER.info(msg)
+        if LOGGER.isEnabledFor(logging.INFO):
+            cmd_str = " ".join(str(c) for c in cmd)
+            msg = f"Executing command: '{cmd_str}'"
+            LOGGER.info(msg)
         try:
             completed = subprocess.run(
                 cmd,  # noqa: S603
@@ -65,6 +67,10 @@ class HugrCompiler(StageCompiler):
             "func public @main",
         )
 
+    def cache_tag(self) -> str:
+        """Identifies the `hugr-mlir-translate` binary."""
+        return tool_identity(self._get_compiler()[0])
+
     def _get_compiler(self) -> tuple[Path, bool]:
         """Returns the path to the `hugr-mlir-translate` binary.
 
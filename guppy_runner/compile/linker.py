@@ -1,6 +1,7 @@
 """Utilities to link and run the final LLVM artifact."""
 
 
+import logging
 import os
 import subprocess
 from pathlib import Path
@@ -12,7 +13,7 @@ from guppy_runner.compile import (
     UnsupportedEncodingError,
 )
 from guppy_runner.stage import EncodingMode, Stage
-from guppy_runner.util import LOGGER
+from guppy_runner.util import LOGGER, tool_identity
 
 CLANG = "clang"
 QIR_BACKEND_LIBS_ENV = "QIR_BACKEND_LIBS"
@@ -46,7 +47,7 @@ class Linker(StageCompiler):
         if not output_path:
             output_path = DEFAULT_BIN
 
-        cmd = [
+        cmd: list[str | Path] = [
             self._get_compiler()[0],
             input_path,
             "-o",
@@ -57,9 +58,10 @@ class Linker(StageCompiler):
             "-lm",
         ]
 
-        cmd_str = " ".join(str(c) for c in cmd)
-        msg = f"Executing command: '{cmd_str}'"
-        LOGGER.info(msg)
+        if LOGGER.isEnabledFor(logging.INFO):
+            cmd_str = " ".join(str(c) for c in cmd)
+            msg = f"Executing command: '{cmd_str}'"
+            LOGGER.info(msg)
         try:
             subprocess.run(
                 cmd,  # noqa: S603
@@ -74,6 +76,11 @@ class Linker(StageCompiler):
 
         return output_path
 
+    def cache_tag(self) -> str:
+        """Identifies the `clang` binary and the QIR library path."""
+        qir_libs = os.environ.get(QIR_BACKEND_LIBS_ENV, "")
+        return f"{tool_identity(self._get_compiler()[0])}:{qir_libs}"
+
     def _get_compiler(self) -> tuple[Path, bool]:
         """Returns the path to the `clang` binary.
 
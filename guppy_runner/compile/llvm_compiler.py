@@ -1,8 +1,13 @@
 """Utilities to link and run the final LLVM artifact."""
 
 
+import functools
+import logging
 import os
+import shlex
+import shutil
 import subprocess
+from collections.abc import Sequence
 from pathlib import Path
 from subprocess import CalledProcessError
 
@@ -16,10 +21,26 @@ from guppy_runner.util import LOGGER
 
 LLC = "llc"
 LLC_ENV = "LLC"
+LLC_FLAGS = ["--filetype=obj"]
+# Valid values for `llc -O<level>`.
+OPT_LEVELS = range(4)
 
 # TODO: Find the way to use a temporary file that gets deleted afterwards.
 DEFAULT_OBJ = Path("a.o")
 
+# Memoized `llc --version` outputs, keyed by the resolved binary path and its
+# modification time.
+_LLC_VERSIONS: dict[tuple[str, int], bytes] = {}
+
+# Leading bytes of ELF and Mach-O (32/64-bit, either endianness) object files.
+OBJECT_MAGICS = (
+    b"\x7fELF",
+    b"\xfe\xed\xfa\xce",
+    b"\xfe\xed\xfa\xcf",
+    b"\xce\xfa\xed\xfe",
+    b"\xcf\xfa\xed\xfe",
+)
+
 
 class LlvmCompiler(StageCompiler):
     """A processor for running an LLVMIR artifact."""
@@ -27,6 +48,16 @@ class LlvmCompiler(StageCompiler):
     INPUT_STAGE: Stage = Stage.LLVM
     OUTPUT_STAGE: Stage = Stage.OBJECT
 
+    def __init__(self, optimization_level: int = 0) -> None:
+        """Initialize the compiler.
+
+        :param optimization_level: The `llc` optimization level, from 0 to 3.
+            Defaults to 0, as the objects are usually linked and run right away.
+        """
+        if optimization_level not in OPT_LEVELS:
+            raise InvalidOptLevelError(optimization_level)
+        self.optimization_level = optimization_level
+
     def process_stage(  # noqa: PLR0913
         self,
         *,
@@ -46,37 +77,110 @@ class LlvmCompiler(StageCompiler):
         if not output_path:
             output_path = DEFAULT_OBJ
 
-        output_as_text = output_encoding == EncodingMode.TEXTUAL
-        cmd = [self._get_compiler()[0], input_path, "--filetype=obj"]
-        if output_path:
-            cmd += ["-o", output_path]
+        return _compile_object(
+            self._get_compiler()[0],
+            input_path,
+            output_path,
+            self.optimization_level,
+        )
+
+    def cache_tag(self) -> str:
+        """The `llc` version and the optimization level of the produced objects."""
+        version = _llc_version(self._get_compiler()[0]).decode(errors="replace")
+        return f"{version}:-O{self.optimization_level}"
 
-        cmd_str = " ".join(str(c) for c in cmd)
+    def _get_compiler(self) -> tuple[Path, bool]:
+        """Returns the path to the `llc` binary.
+
+        The returned boolean indicates whether the path was overridden via the
+        environment variable.
+        """
+        return (_resolve_llc(), LLC_ENV in os.environ)
+
+
+def _compile_object(
+    llc: Path,
+    input_path: Path,
+    output_path: Path,
+    optimization_level: int,
+) -> Path:
+    """Compile an LLVMIR file into an object file with `llc`.
+
+    Inputs that are already object files are copied as-is.
+    """
+    flags = [*LLC_FLAGS, f"-O{optimization_level}"]
+    try:
+        if _is_object_file(input_path):
+            LOGGER.info("'%s' is already an object file, skipping llc", input_path)
+            if not output_path.exists() or not input_path.samefile(output_path):
+                shutil.copyfile(input_path, output_path)
+            return output_path
+    except OSError as err:
+        raise ObjectFileError(err) from err
+
+    cmd = [os.fspath(llc), os.fspath(input_path), *flags]
+    cmd += ["-o", os.fspath(output_path)]
+
+    if LOGGER.isEnabledFor(logging.INFO):
+        cmd_str = " ".join(cmd)
         msg = f"Executing command: '{cmd_str}'"
         LOGGER.info(msg)
+    # `llc` writes the object to `output_path`, so only stderr is captured.
+    # As `llc` is an absolute path and `close_fds=False`, subprocess can
+    # spawn it with `posix_spawn`.
+    try:
+        proc = subprocess.Popen(
+            cmd,  # noqa: S603
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            close_fds=False,
+        )
+    except FileNotFoundError as err:
+        raise LlcNotFoundError from err
+    _, stderr = proc.communicate()
+    if proc.returncode != 0:
+        raise LlcError(stderr, cmd)
+
+    return output_path
+
+
+@functools.cache
+def _resolve_llc() -> Path:
+    """Returns the absolute path to the `llc` binary.
+
+    Looks for it in your PATH by default, unless a "LLC" env variable is set.
+    The result is cached, so the PATH is only searched once per process.
+    """
+    override = os.environ.get(LLC_ENV)
+    path = shutil.which(override) if override else shutil.which(LLC)
+    if path is None:
+        raise LlcNotFoundError
+    return Path(path)
+
+
+def _llc_version(llc: Path) -> bytes:
+    """Returns the output of `llc --version`, memoized per binary."""
+    key = (os.fspath(llc), llc.stat().st_mtime_ns)
+    if key not in _LLC_VERSIONS:
+        cmd = [os.fspath(llc), "--version"]
         try:
-            subprocess.run(
+            completed = subprocess.run(
                 cmd,  # noqa: S603
                 capture_output=True,
                 check=True,
-                text=output_as_text,
             )
         except FileNotFoundError as err:
             raise LlcNotFoundError from err
         except CalledProcessError as err:
-            raise LlcError(err) from err
-
-        return output_path
+            raise LlcError(err.stderr, cmd) from err
+        _LLC_VERSIONS[key] = completed.stdout
+    return _LLC_VERSIONS[key]
 
-    def _get_compiler(self) -> tuple[Path, bool]:
-        """Returns the path to the `llc` binary.
 
-        The returned boolean indicates whether the path was overridden via the
-        environment variable.
-        """
-        if LLC_ENV in os.environ:
-            return (Path(os.environ[LLC_ENV]), True)
-        return (Path(LLC), False)
+def _is_object_file(path: Path) -> bool:
+    """Returns whether the file starts with a known object file magic number."""
+    with path.open("rb") as f:
+        return f.read(4) in OBJECT_MAGICS
 
 
 class LlvmError(CompilerError):
@@ -91,12 +195,31 @@ class LlcNotFoundError(LlvmError):
         super().__init__(f"Could not find '{LLC}' binary in your $PATH.")
 
 
+class ObjectFileError(LlvmError):
+    """Raised when the input or output files of `llc` cannot be accessed."""
+
+    def __init__(self, err: OSError) -> None:
+        """Initialize the error from the failed file operation."""
+        super().__init__(f"Could not produce the object file: {err}")
+
+
+class InvalidOptLevelError(LlvmError):
+    """Raised when the requested `llc` optimization level does not exist."""
+
+    def __init__(self, level: int) -> None:
+        """Initialize the error."""
+        super().__init__(
+            f"Invalid optimization level {level}, expected a value from 0 to 3.",
+        )
+
+
 class LlcError(LlvmError):
     """Raised when the translation program cannot be found."""
 
-    def __init__(self, perror: CalledProcessError) -> None:
-        """Initialize the error."""
-        err_line = next(iter(perror.stderr.splitlines()), "")
+    def __init__(self, stderr: bytes, cmd: Sequence[str]) -> None:
+        """Initialize the error from the failed command and its stderr output."""
+        err_line = next(iter(stderr.decode(errors="replace").splitlines()), "")
+        cmd_str = shlex.join(cmd)
         super().__init__(
-            f"An error occurred while calling '{LLC}':\n{err_line}",
+            f"An error occurred while calling '{LLC}':\n{cmd_str}\n{err_line}",
         )
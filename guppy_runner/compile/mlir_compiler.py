@@ -1,6 +1,7 @@
 """Methods for producing runnable artifacts from MLIR objects."""
 
 
+import logging
 import os
 import subprocess
 from pathlib import Path
@@ -8,7 +9,7 @@ from subprocess import CalledProcessError
 
 from guppy_runner.compile import CompilerError, StageCompiler, UnsupportedEncodingError
 from guppy_runner.stage import EncodingMode, Stage
-from guppy_runner.util import LOGGER
+from guppy_runner.util import LOGGER, tool_identity
 
 MLIR_TRANSLATE = "mlir-translate"
 MLIR_TRANSLATE_ENV = "MLIR_TRANSLATE"
@@ -37,11 +38,16 @@ class MLIRCompiler(StageCompiler):
             raise UnsupportedEncodingError(self.OUTPUT_STAGE, output_encoding)
 
         output_as_text = output_encoding == EncodingMode.TEXTUAL
-        cmd = [self._get_compiler()[0], input_path, "--mlir-to-llvmir"]
-
-        cmd_str = " ".join(str(c) for c in cmd)
-        msg = f"Executing command: '{cmd_str}'"
-        LOGGER.info(msg)
+        cmd: list[str | Path] = [
+            self._get_compiler()[0],
+            input_path,
+            "--mlir-to-llvmir",
+        ]
+
+        if LOGGER.isEnabledFor(logging.INFO):
+            cmd_str = " ".join(str(c) for c in cmd)
+            msg = f"Executing command: '{cmd_str}'"
+            LOGGER.info(msg)
         try:
             completed = subprocess.run(
                 cmd,  # noqa: S603
@@ -55,6 +61,10 @@ class MLIRCompiler(StageCompiler):
             raise MlirTranslateError(err) from err
         return completed.stdout
 
+    def cache_tag(self) -> str:
+        """Identifies the `mlir-translate` binary."""
+        return tool_identity(self._get_compiler()[0])
+
     def _get_compiler(self) -> tuple[Path, bool]:
         """Returns the path to the `mlir-translate` binary.
 
@@ -1,6 +1,7 @@
 """Methods for producing runnable artifacts from MLIR objects."""
 
 
+import logging
 import os
 import subprocess
 from pathlib import Path
@@ -8,7 +9,7 @@ from subprocess import CalledProcessError
 
 from guppy_runner.compile import CompilerError, StageCompiler
 from guppy_runner.stage import EncodingMode, Stage
-from guppy_runner.util import LOGGER
+from guppy_runner.util import LOGGER, tool_identity
 
 HUGR_MLIR_OPT = "hugr-mlir-opt"
 HUGR_MLIR_OPT_ENV = "HUGR_MLIR_OPT"
@@ -34,13 +35,14 @@ class MLIRLowerer(StageCompiler):
         _ = input_encoding, output_path, temp_file, module_name
 
         output_as_text = output_encoding == EncodingMode.TEXTUAL
-        cmd = [self._get_compiler()[0], input_path, "--lower-hugr"]
+        cmd: list[str | Path] = [self._get_compiler()[0], input_path, "--lower-hugr"]
         if not output_as_text:
             cmd += ["--emit-bytecode"]
 
-        cmd_str = " ".join(str(c) for c in cmd)
-        msg = f"Executing command: '{cmd_str}'"
-        LOGGER.info(msg)
+        if LOGGER.isEnabledFor(logging.INFO):
+            cmd_str = " ".join(str(c) for c in cmd)
+            msg = f"Executing command: '{cmd_str}'"
+            LOGGER.info(msg)
         try:
             completed = subprocess.run(
                 cmd,  # noqa: S603
@@ -54,6 +56,10 @@ class MLIRLowerer(StageCompiler):
             raise MlirOptError(err) from err
         return completed.stdout
 
+    def cache_tag(self) -> str:
+        """Identifies the `hugr-mlir-opt` binary."""
+        return tool_identity(self._get_compiler()[0])
+
     def _get_compiler(self) -> tuple[Path, bool]:
         """Returns the path to the `hugr-mlir-opt` binary.
 
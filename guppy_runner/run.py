@@ -1,6 +1,7 @@
 """Runner for the compiled guppy binary."""
 
 
+import logging
 import subprocess
 from pathlib import Path
 
@@ -13,9 +14,10 @@ def run_guppy_bin(binary: Path) -> None:
         binary.absolute(),
     ]
 
-    cmd_str = " ".join(str(c) for c in cmd)
-    msg = f"Executing command: '{cmd_str}'"
-    LOGGER.info(msg)
+    if LOGGER.isEnabledFor(logging.INFO):
+        cmd_str = " ".join(str(c) for c in cmd)
+        msg = f"Executing command: '{cmd_str}'"
+        LOGGER.info(msg)
 
     print("----------------------")
     print("Executing the program:")
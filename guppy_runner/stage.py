@@ -81,7 +81,7 @@ class Stage(Enum):
         """Returns the default file encoding for the stage."""
         return {
             Stage.GUPPY: EncodingMode.TEXTUAL,
-            Stage.HUGR: EncodingMode.TEXTUAL,
+            Stage.HUGR: EncodingMode.BITCODE,
             Stage.HUGR_MLIR: EncodingMode.TEXTUAL,
             Stage.LOWERED_MLIR: EncodingMode.TEXTUAL,
             Stage.LLVM: EncodingMode.TEXTUAL,
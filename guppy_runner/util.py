@@ -1,5 +1,70 @@
 """Utility functions and definitions for guppy_runner."""
 
 import logging
+import os
+from pathlib import Path
 
 LOGGER = logging.getLogger(__name__)
+# Library code should not configure logging. Messages are only shown once the
+# application adds a handler, see `guppy_runner.__main__.main`.
+LOGGER.addHandler(logging.NullHandler())
+
+CACHE_DIR_ENV = "XDG_CACHE_HOME"
+CACHE_ENV = "GUPPY_RUNNER_CACHE"
+
+# Read size used when hashing files.
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def cache_dir() -> Path:
+    """Returns the directory where guppy_runner stores its cached files.
+
+    This is `~/.cache/guppy_runner` by default, or `$XDG_CACHE_HOME/guppy_runner`
+    if the environment variable is set.
+    """
+    if CACHE_DIR_ENV in os.environ:
+        return Path(os.environ[CACHE_DIR_ENV]) / "guppy_runner"
+    return Path.home() / ".cache" / "guppy_runner"
+
+
+def cache_enabled() -> bool:
+    """Returns whether the compilation caches are enabled.
+
+    They are enabled by setting the `GUPPY_RUNNER_CACHE` environment variable
+    to `1`.
+    """
+    return os.environ.get(CACHE_ENV) == "1"
+
+
+def tool_identity(tool: Path) -> str:
+    """Identifies an external tool by its resolved path and modification time.
+
+    Used in cache keys, so that replacing or updating a tool invalidates the
+    artifacts it produced. Tools that cannot be found are identified by name.
+    """
+    import shutil
+
+    resolved = shutil.which(os.fspath(tool))
+    if resolved is None:
+        return os.fspath(tool)
+    try:
+        return f"{resolved}:{Path(resolved).stat().st_mtime_ns}"
+    except OSError:
+        return resolved
+
+
+def hash_file(path: Path) -> bytes:
+    """Returns the sha256 digest of a file.
+
+    The file is read in 1MiB chunks into a single reused buffer, without an
+    additional python-level read buffer.
+    """
+    import hashlib
+
+    digest = hashlib.sha256()
+    buffer = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buffer)
+    with path.open("rb", buffering=0) as file:
+        while size := file.readinto(buffer):
+            digest.update(view[:size])
+    return digest.digest()
@@ -0,0 +1,152 @@
+"""Tests for the stage artifact cache."""
+
+from pathlib import Path
+
+import pytest
+
+from guppy_runner.cache import CacheError, StageCache
+from guppy_runner.compile import StageCompiler
+from guppy_runner.stage import EncodingMode, Stage, StageData
+
+LLVM_PROGRAM = "define i32 @main() {\n  ret i32 0\n}\n"
+
+
+class ReversingCompiler(StageCompiler):
+    """A fake compiler that reverses its input, counting the executions."""
+
+    INPUT_STAGE: Stage = Stage.LLVM
+    OUTPUT_STAGE: Stage = Stage.OBJECT
+
+    def __init__(self, tag: str = "") -> None:
+        """Initialize the compiler with the given cache tag."""
+        self.calls = 0
+        self.tag = tag
+
+    def process_stage(  # noqa: PLR0913
+        self,
+        *,
+        input_path: Path,
+        input_encoding: EncodingMode,
+        output_path: Path | None,
+        output_encoding: EncodingMode,
+        temp_file: bool = False,
+        module_name: str | None = None,
+    ) -> str | bytes | Path:
+        """Reverse the input bytes."""
+        _ = input_encoding, output_path, output_encoding, temp_file, module_name
+        self.calls += 1
+        return input_path.read_bytes()[::-1]
+
+    def cache_tag(self) -> str:
+        """Returns the configured tag."""
+        return self.tag
+
+
+class ReversingLinker(ReversingCompiler):
+    """A fake linker that reverses its input, counting the executions."""
+
+    INPUT_STAGE: Stage = Stage.OBJECT
+    OUTPUT_STAGE: Stage = Stage.EXECUTABLE
+
+
+def llvm_input(program: str = LLVM_PROGRAM) -> StageData:
+    return StageData(Stage.LLVM, program, EncodingMode.TEXTUAL)
+
+
+def test_miss_then_hit(tmp_path: Path):
+    cache = StageCache(tmp_path / "cache")
+    compiler = ReversingCompiler()
+    data = llvm_input()
+    key = cache.input_key(data, None)
+
+    output, output_key = cache.run(compiler, data, key)
+    assert compiler.calls == 1
+    assert output.stage == Stage.OBJECT
+    assert output.data == LLVM_PROGRAM.encode()[::-1]
+
+    cached, cached_key = cache.run(compiler, data, key)
+    assert compiler.calls == 1
+    assert cached_key == output_key
+    assert cached.stage == Stage.OBJECT
+    assert cached.data == output.data
+
+
+def test_hit_copies_to_output_file(tmp_path: Path):
+    cache = StageCache(tmp_path / "cache")
+    compiler = ReversingCompiler()
+    data = llvm_input()
+    key = cache.input_key(data, None)
+    cache.run(compiler, data, key)
+
+    output_file = tmp_path / "out.o"
+    cache.run(compiler, data, key, output_file=output_file)
+    assert compiler.calls == 1
+    assert output_file.read_bytes() == LLVM_PROGRAM.encode()[::-1]
+
+
+def test_key_chaining(tmp_path: Path):
+    cache = StageCache(tmp_path / "cache")
+    data = llvm_input()
+    key = cache.input_key(data, None)
+
+    assert key == cache.input_key(llvm_input(), None)
+    assert key != cache.input_key(llvm_input(LLVM_PROGRAM + "\n"), None)
+    assert key != cache.input_key(data, "other_module")
+
+    _, output_key = cache.run(ReversingCompiler(), data, key)
+    _, other_output_key = cache.run(ReversingCompiler(), data, key + "0")
+    assert output_key not in (key, other_output_key)
+
+
+def test_compiler_options_miss(tmp_path: Path):
+    cache = StageCache(tmp_path / "cache")
+    data = llvm_input()
+    key = cache.input_key(data, None)
+
+    _, output_key = cache.run(ReversingCompiler("-O0"), data, key)
+    compiler = ReversingCompiler("-O3")
+    _, other_output_key = cache.run(compiler, data, key)
+    assert compiler.calls == 1
+    assert output_key != other_output_key
+
+
+def test_upstream_tool_change_miss(tmp_path: Path):
+    cache = StageCache(tmp_path / "cache")
+    data = llvm_input()
+    key = cache.input_key(data, None)
+
+    obj, obj_key = cache.run(ReversingCompiler("llc 14"), data, key)
+    linker = ReversingLinker("clang")
+    cache.run(linker, obj, obj_key)
+    cache.run(linker, obj, obj_key)
+    assert linker.calls == 1
+
+    # A different upstream tool invalidates all the downstream artifacts.
+    compiler = ReversingCompiler("llc 15")
+    new_obj, new_obj_key = cache.run(compiler, data, key)
+    assert compiler.calls == 1
+    assert new_obj_key != obj_key
+    cache.run(linker, new_obj, new_obj_key)
+    assert linker.calls == 2
+
+
+def test_unreadable_input(tmp_path: Path):
+    cache = StageCache(tmp_path / "cache")
+    data = StageData.from_path(
+        Stage.LLVM,
+        tmp_path / "missing.ll",
+        EncodingMode.TEXTUAL,
+    )
+    with pytest.raises(CacheError):
+        cache.input_key(data, None)
+
+
+def test_unwritable_output_file(tmp_path: Path):
+    cache = StageCache(tmp_path / "cache")
+    compiler = ReversingCompiler()
+    data = llvm_input()
+    key = cache.input_key(data, None)
+    cache.run(compiler, data, key)
+
+    with pytest.raises(CacheError):
+        cache.run(compiler, data, key, output_file=tmp_path / "missing" / "out.o")
@@ -0,0 +1,87 @@
+"""Tests for the command line argument parsing."""
+
+import pytest
+
+from guppy_runner.__main__ import build_parser
+from guppy_runner._cli_fast import FLAG_TABLE, Args, parse_args_fast
+
+ARGVS = [
+    [],
+    ["program.py"],
+    ["-v", "program.py"],
+    ["--verbose", "--module", "my_module", "program.py"],
+    ["--module=my_module", "program.py"],
+    ["--hugr", "program.msgpack", "--store-llvm", "out.ll"],
+    ["--hugr", "--textual", "program.hugr"],
+    ["--hugr-mlir", "program.mlir", "--bitcode"],
+    ["--llvm-mlir", "program.mlirbc", "--no-run"],
+    ["--llvm", "program.ll", "--store-obj", "out.o", "--store-bin=a.out"],
+    [
+        "program.py",
+        "--store-hugr",
+        "out.json",
+        "--store-hugr-mlir",
+        "out.mlir",
+        "--store-llvm-mlir",
+        "out.mlirbc",
+        "--store-llvm",
+        "out.bc",
+    ],
+    ["program.py", "-o", "out", "--no-run"],
+    ["program.py", "--output=out"],
+    ["program.py", "--llc-opt", "2"],
+    ["program.py", "--llc-opt=3", "--store-obj", "out.o"],
+    ["program.py", "--release"],
+]
+
+# Arguments that must be handled by the full parser.
+FALLBACK_ARGVS = [
+    ["--help"],
+    ["-h"],
+    ["--verb", "program.py"],
+    ["program.py", "other.py"],
+    ["--hugr", "--llvm", "program.hugr"],
+    ["--bitcode", "--textual", "program.hugr"],
+    ["program.py", "--release", "--llc-opt", "1"],
+    ["program.py", "--store-obj"],
+    ["program.py", "--no-run=1"],
+]
+
+
+def parser_options() -> dict[str, tuple[str, bool]]:
+    """Returns the `build_parser` options, as `flag: (dest, takes_value)`."""
+    return {
+        flag: (action.dest, action.nargs != 0)
+        for action in build_parser()._actions  # noqa: SLF001
+        for flag in action.option_strings
+        if action.dest != "help"
+    }
+
+
+def test_flag_table_matches_parser():
+    assert {
+        flag: (dest, takes_value) for flag, (dest, takes_value, _) in FLAG_TABLE.items()
+    } == parser_options()
+
+
+def test_flag_table_groups_match_parser():
+    parser_groups = {
+        frozenset(action.dest for action in group._group_actions)  # noqa: SLF001
+        for group in build_parser()._mutually_exclusive_groups  # noqa: SLF001
+    }
+    table_groups: dict[str, set[str]] = {}
+    for dest, _, group in FLAG_TABLE.values():
+        if group:
+            table_groups.setdefault(group, set()).add(dest)
+    assert {frozenset(dests) for dests in table_groups.values()} == parser_groups
+
+
+@pytest.mark.parametrize("argv", ARGVS)
+def test_fast_parser_matches_parser(argv: list[str]):
+    expected = build_parser().parse_args(argv, namespace=Args())
+    assert parse_args_fast(argv) == expected
+
+
+@pytest.mark.parametrize("argv", FALLBACK_ARGVS)
+def test_fast_parser_fallback(argv: list[str]):
+    assert parse_args_fast(argv) is None
@@ -0,0 +1,20 @@
+"""Tests for the shared compiler utilities."""
+
+from pathlib import Path
+
+import pytest
+
+from guppy_runner.compile import ArtifactWriter
+
+
+def test_writer_stores_artifacts(tmp_path: Path):
+    path = tmp_path / "artifact"
+    with ArtifactWriter() as writer:
+        writer.submit(path.write_text, "data")
+    assert path.read_text() == "data"
+
+
+def test_writer_reraises_on_exit(tmp_path: Path):
+    path = tmp_path / "missing" / "artifact"
+    with pytest.raises(FileNotFoundError), ArtifactWriter() as writer:
+        writer.submit(path.write_text, "data")
@@ -69,3 +69,4 @@ def test_from_module():
             bin_out=Path(temp_bin.name),
             no_run=True,
         )
+
@@ -0,0 +1,112 @@
+"""Tests for the LLVMIR to object compilation, using `llc`."""
+
+import shlex
+import subprocess
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from guppy_runner.cache import StageCache
+from guppy_runner.compile.llvm_compiler import (
+    InvalidOptLevelError,
+    LlcError,
+    LlvmCompiler,
+)
+from guppy_runner.stage import EncodingMode, Stage, StageData
+
+LLVM_PROGRAM = "define i32 @main() {\n  ret i32 0\n}\n"
+
+
+@pytest.fixture
+def llvm_file(tmp_path: Path) -> Path:
+    path = tmp_path / "program.ll"
+    path.write_text(LLVM_PROGRAM)
+    return path
+
+
+@pytest.fixture
+def llc_runs(monkeypatch: pytest.MonkeyPatch) -> list[list[str]]:
+    """Records the `llc` compilations, ignoring the `--version` queries."""
+    runs: list[list[str]] = []
+    popen = subprocess.Popen
+
+    def recording_popen(cmd: list[str], *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        if "-o" in cmd:
+            runs.append(cmd)
+        return popen(cmd, *args, **kwargs)
+
+    monkeypatch.setattr(subprocess, "Popen", recording_popen)
+    return runs
+
+
+def llvm_input(path: Path) -> StageData:
+    return StageData.from_path(Stage.LLVM, path, EncodingMode.TEXTUAL)
+
+
+def test_cache_miss_then_hit(
+    tmp_path: Path,
+    llvm_file: Path,
+    llc_runs: list[list[str]],
+):
+    cache = StageCache(tmp_path / "cache")
+    data = llvm_input(llvm_file)
+    key = cache.input_key(data, None)
+
+    first_obj = tmp_path / "first.o"
+    cache.run(LlvmCompiler(), data, key, output_file=first_obj)
+    assert len(llc_runs) == 1
+
+    second_obj = tmp_path / "second.o"
+    cache.run(LlvmCompiler(), data, key, output_file=second_obj)
+    assert len(llc_runs) == 1
+    assert second_obj.read_bytes() == first_obj.read_bytes()
+
+
+def test_cache_opt_level_miss(
+    tmp_path: Path,
+    llvm_file: Path,
+    llc_runs: list[list[str]],
+):
+    cache = StageCache(tmp_path / "cache")
+    data = llvm_input(llvm_file)
+    key = cache.input_key(data, None)
+
+    cache.run(LlvmCompiler(0), data, key, output_file=tmp_path / "o0.o")
+    cache.run(LlvmCompiler(2), data, key, output_file=tmp_path / "o2.o")
+    assert len(llc_runs) == 2
+    assert "-O2" in llc_runs[1]
+
+
+def test_object_passthrough(
+    tmp_path: Path,
+    llvm_file: Path,
+    llc_runs: list[list[str]],
+):
+    obj = tmp_path / "program.o"
+    LlvmCompiler().run(llvm_input(llvm_file), output_file=obj)
+    assert obj.read_bytes().startswith(b"\x7fELF")
+    assert len(llc_runs) == 1
+
+    copy = tmp_path / "copy.o"
+    LlvmCompiler().run(llvm_input(obj), output_file=copy)
+    assert len(llc_runs) == 1
+    assert copy.read_bytes() == obj.read_bytes()
+
+
+def test_invalid_opt_level():
+    with pytest.raises(InvalidOptLevelError):
+        LlvmCompiler(4)
+
+
+def test_llc_error(tmp_path: Path):
+    invalid = tmp_path / "invalid program.ll"
+    invalid.write_text("not llvm")
+    obj = tmp_path / "out.o"
+
+    with pytest.raises(LlcError) as err:
+        LlvmCompiler().run(llvm_input(invalid), output_file=obj)
+
+    llc = LlvmCompiler()._get_compiler()[0]  # noqa: SLF001
+    cmd = [str(llc), str(invalid), "--filetype=obj", "-O0", "-o", str(obj)]
+    assert shlex.join(cmd) in str(err.value)